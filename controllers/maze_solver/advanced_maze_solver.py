@@ -3,20 +3,47 @@
 
 from controller import Robot
 import math
-import time
 from enum import Enum
+from maze_kernel import (FRONT, PLEDGE_HEADING_TOLERANCE, WALL_SENSOR_BITS, build_lut,
+                         left_wall_follow, pledge_follow, right_wall_follow, sensor_mask,
+                         speed_profile)
+from maze_log import LogWriter
 
 class Algorithm(Enum):
     LEFT_WALL = "left_wall"
     RIGHT_WALL = "right_wall"
     PLEDGE = "pledge"
 
+# Kernel decision function for each Algorithm
+FOLLOWERS = {
+    Algorithm.LEFT_WALL: left_wall_follow,
+    Algorithm.RIGHT_WALL: right_wall_follow,
+    Algorithm.PLEDGE: pledge_follow
+}
+
+WALL_THRESHOLD = 0.08  # Normalized; adjust based on your sensor calibration
+
 class AdvancedMazeSolver:
+    __slots__ = ('robot', 'algorithm', 'timestep', 'max_speed', '_lut_near', '_lut_far',
+                 'left_motor', 'right_motor', '_last_left', '_last_right',
+                 'sensors', '_get_fns', '_sensor_buf',
+                 'pledge_angle', 'total_rotation', 'steps_taken', 'walls_followed',
+                 '_decision_interval', '_front_blocked', '_log')
+    
     def __init__(self, robot, algorithm=Algorithm.LEFT_WALL):
         self.robot = robot
         self.algorithm = algorithm
         self.timestep = 32
         self.max_speed = 6.28
+        
+        # Decisions for every sensor mask, precomputed near and away from the
+        # original heading (only the Pledge algorithm tells them apart); a
+        # rotation of PLEDGE_HEADING_TOLERANCE already counts as away
+        follow = FOLLOWERS[algorithm]
+        speeds = speed_profile(self.max_speed)
+        self._lut_near = build_lut(follow, 0, speeds)
+        self._lut_far = build_lut(follow, PLEDGE_HEADING_TOLERANCE, speeds)
+        
         self.setup_motors()
         self.setup_sensors()
         
@@ -25,10 +52,16 @@ class AdvancedMazeSolver:
         self.total_rotation = 0
         
         # Performance tracking
-        self.start_time = time.time()
         self.steps_taken = 0
         self.walls_followed = 0
         
+        # Sensors are read every step, the algorithm re-plans every few steps
+        self._decision_interval = 3
+        self._front_blocked = False
+        
+        # Status messages, written out while run() is active
+        self._log = LogWriter()
+        
     def setup_motors(self):
         """Initialize motors"""
         self.left_motor = self.robot.getDevice("left wheel motor")
@@ -39,6 +72,10 @@ class AdvancedMazeSolver:
         self.left_motor.setVelocity(0)
         self.right_motor.setVelocity(0)
         
+        # Speeds last sent by set_motor_velocities, which only calls setVelocity on a change
+        self._last_left = 0.0
+        self._last_right = 0.0
+        
     def setup_sensors(self):
         """Initialize proximity sensors"""
         self.sensors = []
@@ -47,106 +84,38 @@ class AdvancedMazeSolver:
             sensor.enable(self.timestep)
             self.sensors.append(sensor)
             
-    def get_sensor_readings(self):
-        """Get normalized sensor readings"""
-        readings = [sensor.getValue() for sensor in self.sensors]
-        # Normalize readings to 0-1 range
-        normalized = [min(reading / 1000.0, 1.0) for reading in readings]
-        return normalized
-        
-    def detect_walls(self):
-        """Detect walls around the robot"""
-        readings = self.get_sensor_readings()
-        threshold = 0.08  # Adjust based on your sensor calibration
-        
-        return {
-            'front_right': readings[0] > threshold or readings[1] > threshold,
-            'right': readings[2] > threshold,
-            'back_right': readings[3] > threshold,
-            'back': readings[4] > threshold,
-            'back_left': readings[5] > threshold,
-            'left': readings[6] > threshold,
-            'front_left': readings[7] > threshold,
-            'front': readings[7] > threshold or readings[0] > threshold
-        }
-        
-    def left_wall_following(self, walls):
-        """Left-hand rule implementation"""
-        left_speed = self.max_speed
-        right_speed = self.max_speed
-        
-        if walls['front']:
-            # Turn right when blocked
-            left_speed = self.max_speed * 0.8
-            right_speed = -self.max_speed * 0.8
-            self.total_rotation += 90
-            
-        elif walls['left']:
-            # Go forward when wall on left
-            left_speed = self.max_speed
-            right_speed = self.max_speed
-            self.walls_followed += 1
-            
-        elif walls['front_left']:
-            # Slight right turn to maintain distance from wall
-            left_speed = self.max_speed
-            right_speed = self.max_speed * 0.6
+        # Bound getValue methods and the buffer get_sensor_readings normalizes into (a
+        # list, since it is read more than written and list reads create no new floats)
+        self._get_fns = tuple(sensor.getValue for sensor in self.sensors)
+        self._sensor_buf = [0.0] * 8
             
-        else:
-            # Turn left to find wall
-            left_speed = self.max_speed * 0.4
-            right_speed = self.max_speed
-            self.total_rotation -= 45
-            
-        return left_speed, right_speed
-        
-    def right_wall_following(self, walls):
-        """Right-hand rule implementation"""
-        left_speed = self.max_speed
-        right_speed = self.max_speed
-        
-        if walls['front']:
-            # Turn left when blocked
-            left_speed = -self.max_speed * 0.8
-            right_speed = self.max_speed * 0.8
-            self.total_rotation -= 90
-            
-        elif walls['right']:
-            # Go forward when wall on right
-            left_speed = self.max_speed
-            right_speed = self.max_speed
-            self.walls_followed += 1
-            
-        elif walls['front_right']:
-            # Slight left turn to maintain distance from wall
-            left_speed = self.max_speed * 0.6
-            right_speed = self.max_speed
-            
-        else:
-            # Turn right to find wall
-            left_speed = self.max_speed
-            right_speed = self.max_speed * 0.4
-            self.total_rotation += 45
-            
-        return left_speed, right_speed
-        
-    def pledge_algorithm(self, walls):
-        """Pledge algorithm - combination of wall following and angle tracking"""
-        if abs(self.total_rotation) < 10:  # Close to original heading
-            # Move straight when possible
-            if not walls['front']:
-                return self.max_speed, self.max_speed
-                
-        # Use left wall following when not at original heading
-        return self.left_wall_following(walls)
+    def get_sensor_readings(self):
+        """Get normalized sensor readings (shared buffer, overwritten every call)"""
+        buf = self._sensor_buf
+        g0, g1, g2, g3, g4, g5, g6, g7 = self._get_fns
+        # Normalize readings to 0-1 range (unrolled: one Webots call per sensor)
+        buf[0] = min(g0() * 0.001, 1.0)
+        buf[1] = min(g1() * 0.001, 1.0)
+        buf[2] = min(g2() * 0.001, 1.0)
+        buf[3] = min(g3() * 0.001, 1.0)
+        buf[4] = min(g4() * 0.001, 1.0)
+        buf[5] = min(g5() * 0.001, 1.0)
+        buf[6] = min(g6() * 0.001, 1.0)
+        buf[7] = min(g7() * 0.001, 1.0)
+        return buf
         
     def set_motor_velocities(self, left_speed, right_speed):
-        """Set motor velocities with safety bounds"""
-        left_speed = max(-self.max_speed, min(self.max_speed, left_speed))
-        right_speed = max(-self.max_speed, min(self.max_speed, right_speed))
-        
-        self.left_motor.setVelocity(left_speed)
-        self.right_motor.setVelocity(right_speed)
+        """Set motor velocities with safety bounds, skipping unchanged commands"""
+        max_speed = self.max_speed
+        left_speed = min(max(left_speed, -max_speed), max_speed)
+        right_speed = min(max(right_speed, -max_speed), max_speed)
+        
+        if left_speed != self._last_left:
+            self.left_motor.setVelocity(left_speed)
+            self._last_left = left_speed
+        if right_speed != self._last_right:
+            self.right_motor.setVelocity(right_speed)
+            self._last_right = right_speed
         
     def get_algorithm_name(self):
         """Get human-readable algorithm name"""
@@ -159,39 +128,60 @@ class AdvancedMazeSolver:
         
     def print_status(self):
         """Print current status and performance metrics"""
-        elapsed_time = time.time() - self.start_time
-        print(f"\n=== Maze Solver Status ===")
-        print(f"Algorithm: {self.get_algorithm_name()}")
-        print(f"Steps taken: {self.steps_taken}")
-        print(f"Walls followed: {self.walls_followed}")
-        print(f"Total rotation: {self.total_rotation:.1f}°")
-        print(f"Elapsed time: {elapsed_time:.2f}s")
-        print(f"========================\n")
+        # Simulated time, derived from the step count
+        elapsed_time = self.steps_taken * self.timestep * 1e-3
+        self._log.append(
+            f"\n=== Maze Solver Status ===\n"
+            f"Algorithm: {self.get_algorithm_name()}\n"
+            f"Steps taken: {self.steps_taken}\n"
+            f"Walls followed: {self.walls_followed}\n"
+            f"Total rotation: {self.total_rotation:.1f}°\n"
+            f"Elapsed time: {elapsed_time:.2f}s\n"
+            f"========================\n")
         
     def run(self):
         """Main execution loop"""
         print(f"Starting Advanced Maze Solver with {self.get_algorithm_name()}")
         
-        while self.robot.step(self.timestep) != -1:
-            self.steps_taken += 1
-            
-            # Detect surrounding walls
-            walls = self.detect_walls()
-            
-            # Choose algorithm
-            if self.algorithm == Algorithm.LEFT_WALL:
-                left_speed, right_speed = self.left_wall_following(walls)
-            elif self.algorithm == Algorithm.RIGHT_WALL:
-                left_speed, right_speed = self.right_wall_following(walls)
-            elif self.algorithm == Algorithm.PLEDGE:
-                left_speed, right_speed = self.pledge_algorithm(walls)
+        # Loop-invariant methods, tables and constants
+        step = self.robot.step
+        timestep = self.timestep
+        get_sensor_readings = self.get_sensor_readings
+        set_motor_velocities = self.set_motor_velocities
+        decision_interval = self._decision_interval
+        lut_near = self._lut_near
+        lut_far = self._lut_far
+        tolerance = PLEDGE_HEADING_TOLERANCE
+        front_bits = WALL_SENSOR_BITS[FRONT]
+        
+        # Rotation and wall-following counts of the decision in force, booked
+        # every step it is held (as when deciding every step)
+        rotation = followed = 0
+        
+        with self._log:
+            while step(timestep) != -1:
+                self.steps_taken += 1
                 
-            # Apply motor speeds
-            self.set_motor_velocities(left_speed, right_speed)
-            
-            # Print status every 100 steps
-            if self.steps_taken % 100 == 0:
-                self.print_status()
+                # Detect surrounding walls as an 8-bit sensor mask
+                mask = sensor_mask(get_sensor_readings(), WALL_THRESHOLD)
+                
+                # Re-plan every few steps, or at once when a wall appears in front
+                front_blocked = mask & front_bits
+                if (front_blocked and not self._front_blocked
+                        or (self.steps_taken - 1) % decision_interval == 0):
+                    # Look up the chosen algorithm's precomputed decision
+                    lut = lut_near if -tolerance < self.total_rotation < tolerance else lut_far
+                    left_speed, right_speed, rotation, followed = lut[mask]
+                    
+                    # Apply motor speeds, which hold until the next decision
+                    set_motor_velocities(left_speed, right_speed)
+                self._front_blocked = front_blocked
+                self.total_rotation += rotation
+                self.walls_followed += followed
+                
+                # Print status every 100 steps
+                if self.steps_taken % 100 == 0:
+                    self.print_status()
 
 def main():
     """Main function - choose your algorithm here"""
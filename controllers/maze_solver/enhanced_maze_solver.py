@@ -2,16 +2,43 @@
 # Features: Better sensor handling, smoother movements, debugging output
 
 from controller import Robot
-import time
+import contextlib
+from maze_log import LogWriter
+
+# Fixed layout of the array returned by analyze_surroundings
+FRONT_WALL, RIGHT_WALL, STRONG_LEFT_WALL, WEAK_LEFT_WALL = range(4)
+
+# Debug block printed by MazeSolver.run, static parts formatted once
+DEBUG_TEMPLATE = (
+    "Step {}: {}\n"
+    "  Sensor values: [" + ", ".join(["{:.1f}"] * 8) + "]\n"
+    "  Motor speeds: L={:.2f}, R={:.2f}\n"
+    + "-" * 50
+)
 
 class MazeSolver:
+    __slots__ = ('robot', 'timestep', 'max_speed',
+                 '_v_turn', '_v_reverse', '_v_slight', '_v_search',
+                 'left_motor', 'right_motor', '_last_left', '_last_right',
+                 'proximity_sensors', '_sensors_tuple', '_sensor_values', '_surroundings',
+                 'debug', 'log_every')
+    
     def __init__(self, robot):
         self.robot = robot
         self.timestep = 32
         self.max_speed = 6.28
+        
+        # Wheel speeds used by wall_following_logic, computed once
+        self._v_turn = self.max_speed * 0.8
+        self._v_reverse = -self._v_turn
+        self._v_slight = self.max_speed * 0.7
+        self._v_search = self.max_speed * 0.5
+        
         self.setup_motors()
         self.setup_sensors()
+        self._surroundings = [False] * 4
         self.debug = True
+        self.log_every = 10  # Debug print interval while debug is on
         
     def setup_motors(self):
         """Initialize and configure the robot's motors"""
@@ -24,6 +51,10 @@ class MazeSolver:
         self.right_motor.setPosition(float('inf'))
         self.right_motor.setVelocity(0)
         
+        # Current wheel speeds; set_motor_speeds skips commands that match them
+        self._last_left = 0.0
+        self._last_right = 0.0
+        
     def setup_sensors(self):
         """Initialize and enable proximity sensors"""
         self.proximity_sensors = []
@@ -33,78 +64,76 @@ class MazeSolver:
             sensor.enable(self.timestep)
             self.proximity_sensors.append(sensor)
             
+        # Sensor values returned by get_sensor_values (overwritten on each call)
+        self._sensors_tuple = tuple(self.proximity_sensors)
+        self._sensor_values = [0.0] * 8
+            
     def get_sensor_values(self):
-        """Read and return all sensor values"""
-        return [sensor.getValue() for sensor in self.proximity_sensors]
+        """Read all sensor values into the shared buffer and return it"""
+        values = self._sensor_values
+        for i, sensor in enumerate(self._sensors_tuple):
+            values[i] = sensor.getValue()
+        return values
         
     def analyze_surroundings(self):
-        """Analyze sensor data to determine robot's surroundings"""
+        """Analyze sensor data into the shared surroundings array"""
         sensor_values = self.get_sensor_values()
         
-        # Define thresholds for wall detection
+        # Threshold for wall detection (corners use the same value)
         wall_threshold = 80
-        corner_threshold = 80
-        
-        # Analyze key sensors
-        front_wall = sensor_values[7] > wall_threshold or sensor_values[0] > wall_threshold
-        front_right_wall = sensor_values[1] > wall_threshold
-        right_wall = sensor_values[2] > wall_threshold
-        back_right_wall = sensor_values[3] > wall_threshold
-        back_wall = sensor_values[4] > wall_threshold
-        back_left_wall = sensor_values[5] > wall_threshold
-        left_wall = sensor_values[6] > wall_threshold
-        front_left_wall = sensor_values[7] > wall_threshold
-        
-        # More sophisticated analysis
-        strong_left_wall = sensor_values[5] > wall_threshold
-        weak_left_wall = sensor_values[6] > corner_threshold
-        
-        return {
-            'front_wall': front_wall,
-            'left_wall': left_wall,
-            'right_wall': right_wall,
-            'strong_left_wall': strong_left_wall,
-            'weak_left_wall': weak_left_wall,
-            'sensor_values': sensor_values
-        }
+        
+        # Analyze key sensors, one comparison per flag
+        surroundings = self._surroundings
+        surroundings[FRONT_WALL] = sensor_values[7] > wall_threshold or sensor_values[0] > wall_threshold
+        surroundings[RIGHT_WALL] = sensor_values[2] > wall_threshold
+        surroundings[STRONG_LEFT_WALL] = sensor_values[5] > wall_threshold
+        surroundings[WEAK_LEFT_WALL] = sensor_values[6] > wall_threshold
+        
+        return surroundings
         
     def set_motor_speeds(self, left_speed, right_speed):
-        """Set motor speeds with bounds checking"""
-        left_speed = max(-self.max_speed, min(self.max_speed, left_speed))
-        right_speed = max(-self.max_speed, min(self.max_speed, right_speed))
+        """Set motor speeds with bounds checking, skipping unchanged commands"""
+        max_speed = self.max_speed
+        left_speed = min(max(left_speed, -max_speed), max_speed)
+        right_speed = min(max(right_speed, -max_speed), max_speed)
         
-        self.left_motor.setVelocity(left_speed)
-        self.right_motor.setVelocity(right_speed)
+        if left_speed != self._last_left:
+            self.left_motor.setVelocity(left_speed)
+            self._last_left = left_speed
+        if right_speed != self._last_right:
+            self.right_motor.setVelocity(right_speed)
+            self._last_right = right_speed
         
     def wall_following_logic(self, surroundings):
         """Enhanced wall following algorithm"""
-        left_speed = self.max_speed
-        right_speed = self.max_speed
+        max_speed = self.max_speed
+        left_speed = max_speed
+        right_speed = max_speed
         action = "Forward"
         
         # Priority-based decision making
-        if surroundings['front_wall']:
+        if surroundings[FRONT_WALL]:
             # If there's a wall in front, turn right
-            left_speed = self.max_speed * 0.8
-            right_speed = -self.max_speed * 0.8
+            left_speed = self._v_turn
+            right_speed = self._v_reverse
             action = "Turn Right (Front Wall)"
             
-        elif surroundings['strong_left_wall']:
+        elif surroundings[STRONG_LEFT_WALL]:
             # If there's a strong left wall, go forward
-            left_speed = self.max_speed
-            right_speed = self.max_speed
+            left_speed = max_speed
+            right_speed = max_speed
             action = "Forward (Following Left Wall)"
             
-        elif surroundings['weak_left_wall']:
+        elif surroundings[WEAK_LEFT_WALL]:
             # If there's a weak left wall, slightly adjust right
-            left_speed = self.max_speed
-            right_speed = self.max_speed * 0.7
+            left_speed = max_speed
+            right_speed = self._v_slight
             action = "Slight Right (Weak Left Wall)"
             
         else:
             # No left wall detected, turn left to find wall
-            left_speed = self.max_speed * 0.5
-            right_speed = self.max_speed
+            left_speed = self._v_search
+            right_speed = max_speed
             action = "Turn Left (Finding Wall)"
             
         return left_speed, right_speed, action
@@ -114,24 +143,32 @@ class MazeSolver:
         print("Starting Enhanced Maze Solver...")
         step_count = 0
         
-        while self.robot.step(self.timestep) != -1:
-            step_count += 1
-            
-            # Analyze surroundings
-            surroundings = self.analyze_surroundings()
-            
-            # Determine action based on wall following logic
-            left_speed, right_speed, action = self.wall_following_logic(surroundings)
-            
-            # Apply motor speeds
-            self.set_motor_speeds(left_speed, right_speed)
-            
-            # Debug output (every 10 steps to avoid spam)
-            if self.debug and step_count % 10 == 0:
-                print(f"Step {step_count}: {action}")
-                print(f"  Sensor values: {[f'{val:.1f}' for val in surroundings['sensor_values']]}")
-                print(f"  Motor speeds: L={left_speed:.2f}, R={right_speed:.2f}")
-                print("-" * 50)
+        step = self.robot.step
+        timestep = self.timestep
+        analyze_surroundings = self.analyze_surroundings
+        wall_following_logic = self.wall_following_logic
+        set_motor_speeds = self.set_motor_speeds
+        log_every = self.log_every if self.debug else 0  # 0 disables debug output
+        sensor_values = self._sensor_values
+        
+        # Debug messages go through a LogWriter, created only when debugging
+        with (LogWriter() if log_every else contextlib.nullcontext()) as log_writer:
+            log = log_writer.append if log_every else None
+            while step(timestep) != -1:
+                step_count += 1
+                
+                # Analyze surroundings
+                surroundings = analyze_surroundings()
+                
+                # Determine action based on wall following logic
+                left_speed, right_speed, action = wall_following_logic(surroundings)
+                
+                # Apply motor speeds
+                set_motor_speeds(left_speed, right_speed)
+                
+                # Debug output (every log_every steps to avoid spam)
+                if log_every and step_count % log_every == 0:
+                    log(DEBUG_TEMPLATE.format(step_count, action, *sensor_values, left_speed, right_speed))
 
 def main():
     # Create robot instance
@@ -31,16 +31,18 @@ class MazeConfig:
         'OPTIMIZED': 'Optimized adaptive algorithm'
     }
     
-    # Sensor mapping (e-puck robot)
+    # Sensor mapping (e-puck robot): the ring is mirrored left/right, ps0/ps7
+    # face forward, ps1/ps6 are the front diagonals, ps2/ps5 the sides and
+    # ps3/ps4 face backward (same layout as maze_kernel.WALL_SENSOR_BITS)
     SENSOR_POSITIONS = {
         0: 'Front-Right',
-        1: 'Right',
-        2: 'Back-Right', 
-        3: 'Back',
+        1: 'Diag-Right',
+        2: 'Right',
+        3: 'Back-Right',
         4: 'Back-Left',
         5: 'Left',
-        6: 'Front-Left',
-        7: 'Front'
+        6: 'Diag-Left',
+        7: 'Front-Left'
     }
 
 class MazeUtils:
@@ -0,0 +1,91 @@
+# Maze Solver Decision Kernel
+# Pure wall-following decision logic: no Webots calls and no solver state
+# Every follower shares the signature follow(walls, total_rotation, speeds)
+# and returns (left_speed, right_speed, rotation_delta, followed)
+
+# Pledge drives straight while |total_rotation| stays below this many degrees
+PLEDGE_HEADING_TOLERANCE = 10
+
+# Fixed layout of the wall array
+FRONT, LEFT, RIGHT, FRONT_LEFT, FRONT_RIGHT, BACK_LEFT, BACK, BACK_RIGHT = range(8)
+
+# Sensors (bit i = ps<i>) behind each entry of the wall array. The e-puck
+# ring is mirrored left/right: ps0/ps7 face forward, ps1/ps6 are the front
+# diagonals, ps2/ps5 the sides and ps3/ps4 face backward.
+WALL_SENSOR_BITS = (
+    0b10000001,  # FRONT: ps7, ps0
+    0b00100000,  # LEFT: ps5
+    0b00000100,  # RIGHT: ps2
+    0b11000000,  # FRONT_LEFT: ps6, ps7
+    0b00000011,  # FRONT_RIGHT: ps0, ps1
+    0b00010000,  # BACK_LEFT: ps4
+    0b00011000,  # BACK: ps3, ps4
+    0b00001000,  # BACK_RIGHT: ps3
+)
+
+def sensor_mask(readings, threshold):
+    """Compare each reading once: bit i is set when ps<i> sees a wall"""
+    mask = 0
+    for i, reading in enumerate(readings):
+        if reading > threshold:
+            mask |= 1 << i
+    return mask
+
+def fill_walls(mask, walls):
+    """Expand a sensor mask into the wall array, in place"""
+    for i, bits in enumerate(WALL_SENSOR_BITS):
+        walls[i] = bool(mask & bits)
+    return walls
+
+def speed_profile(max_speed):
+    """Precompute follower wheel speeds: (full, turn, reverse, slight, search)"""
+    turn = max_speed * 0.8
+    return max_speed, turn, -turn, max_speed * 0.6, max_speed * 0.4
+
+def left_wall_follow(walls, total_rotation, speeds):
+    """Left-hand rule decision"""
+    full, turn, reverse, slight, search = speeds
+    if walls[FRONT]:
+        # Turn right when blocked
+        return turn, reverse, 90, 0
+
+    if walls[LEFT]:
+        # Go forward when wall on left
+        return full, full, 0, 1
+
+    if walls[FRONT_LEFT]:
+        # Slight right turn to maintain distance from wall
+        return full, slight, 0, 0
+
+    # Turn left to find wall
+    return search, full, -45, 0
+
+def right_wall_follow(walls, total_rotation, speeds):
+    """Right-hand rule decision"""
+    full, turn, reverse, slight, search = speeds
+    if walls[FRONT]:
+        # Turn left when blocked
+        return reverse, turn, -90, 0
+
+    if walls[RIGHT]:
+        # Go forward when wall on right
+        return full, full, 0, 1
+
+    if walls[FRONT_RIGHT]:
+        # Slight left turn to maintain distance from wall
+        return slight, full, 0, 0
+
+    # Turn right to find wall
+    return full, search, 45, 0
+
+def pledge_follow(walls, total_rotation, speeds):
+    """Pledge decision: straight ahead near the original heading, left-hand rule otherwise"""
+    if abs(total_rotation) < PLEDGE_HEADING_TOLERANCE and not walls[FRONT]:
+        full = speeds[0]
+        return full, full, 0, 0
+    return left_wall_follow(walls, total_rotation, speeds)
+
+def build_lut(follow, total_rotation, speeds):
+    """Evaluate a follower once for each of the 256 sensor masks; index the result by mask"""
+    walls = [False] * 8
+    return tuple(follow(fill_walls(mask, walls), total_rotation, speeds) for mask in range(256))
@@ -0,0 +1,52 @@
+# Maze Solver Background Logging
+# Queues messages from the control loop and writes them to stdout on a
+# separate thread, so console I/O never stalls a simulation step
+
+import collections
+import sys
+import threading
+
+class LogWriter:
+    def __init__(self, interval=0.05):
+        self.interval = interval  # Seconds between background writes
+        self._queue = collections.deque()
+        self._stop = threading.Event()
+        self._thread = None
+        
+        # Enqueue a message (bound once, cheap enough for the control loop)
+        self.append = self._queue.append
+        
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+            
+    def __enter__(self):
+        self.start()
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        
+    def close(self):
+        """Stop and join the writer thread, then write whatever is still queued"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        # Only this thread pops now, so messages keep their order
+        self._write()
+        
+    def _write(self):
+        """Write out every queued message"""
+        queue = self._queue
+        while queue:
+            sys.stdout.write(queue.popleft() + '\n')
+        sys.stdout.flush()
+        
+    def _run(self):
+        """Writer loop: drain the queue every interval until stopped"""
+        while not self._stop.wait(self.interval):
+            self._write()
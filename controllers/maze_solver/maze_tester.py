@@ -2,9 +2,14 @@
 # This script helps calibrate sensors and test different movement patterns
 
 from controller import Robot
-import math
+
+# Sensor direction labels printed by sensor_monitor, indexed by sensor number
+# (mirrored e-puck ring; DR/DL are the front diagonals ps1/ps6)
+SENSOR_DIRECTIONS = ("FR", "DR", "R", "BR", "BL", "L", "DL", "FL")
 
 class MazeSolverTester:
+    __slots__ = ('robot', 'timestep', 'max_speed', 'left_motor', 'right_motor', 'sensors')
+    
     def __init__(self, robot):
         self.robot = robot
         self.timestep = 32
@@ -37,14 +42,18 @@ class MazeSolverTester:
         
         min_values = [float('inf')] * 8
         max_values = [0] * 8
+        get_fns = [sensor.getValue for sensor in self.sensors]
         
         for step in range(duration_steps):
             self.robot.step(self.timestep)
             
-            for i, sensor in enumerate(self.sensors):
-                value = sensor.getValue()
-                min_values[i] = min(min_values[i], value)
-                max_values[i] = max(max_values[i], value)
+            # Update the running min/max in place, no per-step lists
+            for i, get_value in enumerate(get_fns):
+                value = get_value()
+                if value < min_values[i]:
+                    min_values[i] = value
+                if value > max_values[i]:
+                    max_values[i] = value
                 
             if step % 20 == 0:
                 print(f"Calibration step {step}/{duration_steps}")
@@ -102,7 +111,7 @@ class MazeSolverTester:
                     print(f"\nStep {step_count}:")
                     print("Sensor readings:")
                     for i, value in enumerate(sensor_values):
-                        direction = ["FR", "R", "BR", "B", "BL", "L", "FL", "F"][i]
+                        direction = SENSOR_DIRECTIONS[i]
                         print(f"  {direction:2}: {value:6.1f}", end="  ")
                         if (i + 1) % 4 == 0:
                             print()  # New line every 4 sensors
@@ -123,8 +132,8 @@ class MazeSolverTester:
             sensor_values = [sensor.getValue() for sensor in self.sensors]
             
             # Simple wall following logic
-            front_sensor = sensor_values[7]  # Front-left sensor
-            left_sensor = sensor_values[5]   # Back-left sensor
+            front_sensor = sensor_values[7]  # Front sensor (left of the two forward-facing ones)
+            left_sensor = sensor_values[5]   # Left side sensor
             
             wall_threshold = 80
             
@@ -2,8 +2,26 @@
 # Features: Speed optimization, path recording, and performance analysis
 
 from controller import Robot
+import sys
 import time
 import math
+from array import array
+
+# Environment flags packed into the decision key, most significant bit first
+ENVIRONMENT_FLAGS = ('front_close', 'front_medium', 'left_close', 'left_medium',
+                     'right_close', 'right_medium')
+
+# Maneuvers chosen by the decision tree
+SHARP_RIGHT_TURN, GRADUAL_RIGHT_TURN, ADJUST_RIGHT, FOLLOW_LEFT_WALL, SEARCH_LEFT_WALL = range(5)
+ACTION_NAMES = ("Sharp Right Turn", "Gradual Right Turn", "Adjust Right",
+                "Following Left Wall", "Search Left Wall")
+
+# Readings averaged by the sensor filter (a power of two, the ring index wraps with a bitmask)
+FILTER_WINDOW = 16
+FILTER_SCALE = 1.0 / FILTER_WINDOW
+
+# Steps between adaptive speed adjustments (a power of two, checked with a bitmask)
+ADAPTIVE_INTERVAL = 128
 
 class OptimizedMazeSolver:
     def __init__(self, robot):
@@ -16,13 +34,38 @@ class OptimizedMazeSolver:
         self.path_length = 0
         self.turns_made = 0
         self.wall_contacts = 0
-        self.position_history = []
+        self.current_action = None  # Action id from the last tick, named by ACTION_NAMES
+        
+        # Whether the previous tick was already adjusting away from a close left
+        # wall, so a contact is counted once per approach rather than every tick
+        self._prev_left_close = False
+        
+        # Odometry: distance per tick for a summed wheel speed (average speed * dt,
+        # rough conversion to path units), accumulated between history samples
+        self._odometry_scale = 0.5 * (self.timestep / 1000.0) * 0.1
+        self._pending_dist = 0.0
+        
+        # Wheel speeds of the previous tick and the odometry increment they gave,
+        # reused while the speeds hold (e.g. steady wall following)
+        self._last_left = 0.0
+        self._last_right = 0.0
+        self._last_increment = 0.0
+        
+        # Position history as parallel typed arrays (one column per metric)
+        self._hist_time = array('d')
+        self._hist_path = array('d')
+        self._hist_turns = array('l')
+        self._hist_walls = array('l')
         
         # Optimization parameters
         self.speed_multiplier = 1.0
         self.turn_speed_ratio = 0.8
         self.corner_speed_ratio = 0.6
         
+        # Decision tree precomputed for every environment flag combination
+        self._speed_table = self.build_speed_table()
+        self.rescale_speed_table()
+        
         self.setup_robot()
         
     def setup_robot(self):
@@ -33,6 +76,10 @@ class OptimizedMazeSolver:
         self.left_motor.setPosition(float('inf'))
         self.right_motor.setPosition(float('inf'))
         
+        # Bound setVelocity methods, called once per motor every step
+        self._set_left = self.left_motor.setVelocity
+        self._set_right = self.right_motor.setVelocity
+        
         # Sensors
         self.sensors = []
         for i in range(8):
@@ -40,119 +87,172 @@ class OptimizedMazeSolver:
             sensor.enable(self.timestep)
             self.sensors.append(sensor)
             
-    def get_optimized_sensor_readings(self):
-        """Get sensor readings with noise filtering"""
-        readings = []
-        for sensor in self.sensors:
-            reading = sensor.getValue()
-            # Simple noise filtering
-            readings.append(reading)
+        # Detection thresholds: very close and medium distance from a wall
+        self._thresholds = (120, 80)
+        
+        # Bound getValue methods and the filtered readings _tick thresholds
+        self._sensor_getvals = tuple(sensor.getValue for sensor in self.sensors)
+        self._readings = [0.0] * 8
+        
+        # Moving-average filter: ring of the last FILTER_WINDOW raw readings
+        # (FILTER_WINDOW rows of 8) and the running sum of each sensor's column
+        self._sensor_ring = [0.0] * (FILTER_WINDOW * 8)
+        self._ring_sum = [0.0] * 8
+        self._ring_idx = 0
             
-        return readings
-        
-    def analyze_maze_environment(self):
-        """Advanced environment analysis"""
-        readings = self.get_optimized_sensor_readings()
-        
-        # Define detection thresholds
-        close_threshold = 120    # Very close to wall
-        medium_threshold = 80    # Medium distance
-        far_threshold = 40       # Far from wall
-        
-        environment = {
-            'front_close': readings[7] > close_threshold or readings[0] > close_threshold,
-            'front_medium': readings[7] > medium_threshold or readings[0] > medium_threshold,
-            'left_close': readings[5] > close_threshold or readings[6] > close_threshold,
-            'left_medium': readings[5] > medium_threshold or readings[6] > medium_threshold,
-            'right_close': readings[1] > close_threshold or readings[2] > close_threshold,
-            'right_medium': readings[1] > medium_threshold or readings[2] > medium_threshold,
-            'readings': readings
-        }
-        
-        return environment
-        
-    def calculate_optimal_speeds(self, environment):
-        """Calculate optimal motor speeds based on environment"""
-        base_speed = self.max_speed * self.speed_multiplier
-        left_speed = base_speed
-        right_speed = base_speed
-        action = "Forward"
+    @staticmethod
+    def environment_flags(key):
+        """Expand a 6-bit environment key into a flag dict (for debugging and table building)"""
+        return {flag: bool(key >> (5 - bit) & 1) for bit, flag in enumerate(ENVIRONMENT_FLAGS)}
         
-        # Advanced decision tree
+    def decide_maneuver(self, environment):
+        """Decision tree: returns (left_ratio, right_ratio, action_id, turns, wall_contacts)"""
+        # Advanced decision tree, speeds as ratios of the base speed
         if environment['front_close']:
             # Sharp turn when very close to front wall
-            left_speed = base_speed * self.turn_speed_ratio
-            right_speed = -base_speed * self.turn_speed_ratio
-            action = "Sharp Right Turn"
-            self.turns_made += 1
+            return self.turn_speed_ratio, -self.turn_speed_ratio, SHARP_RIGHT_TURN, 1, 0
             
         elif environment['front_medium']:
             # Gradual turn when approaching front wall
-            left_speed = base_speed * 0.9
-            right_speed = -base_speed * 0.5
-            action = "Gradual Right Turn"
+            return 0.9, -0.5, GRADUAL_RIGHT_TURN, 0, 0
             
         elif environment['left_close']:
             # Too close to left wall, adjust right
-            left_speed = base_speed
-            right_speed = base_speed * 0.7
-            action = "Adjust Right"
-            self.wall_contacts += 1
+            return 1.0, 0.7, ADJUST_RIGHT, 0, 1
             
         elif environment['left_medium']:
             # Perfect distance from left wall
-            left_speed = base_speed
-            right_speed = base_speed
-            action = "Following Left Wall"
+            return 1.0, 1.0, FOLLOW_LEFT_WALL, 0, 0
             
         else:
             # No left wall, turn left to find it
-            left_speed = base_speed * self.corner_speed_ratio
-            right_speed = base_speed
-            action = "Search Left Wall"
+            return self.corner_speed_ratio, 1.0, SEARCH_LEFT_WALL, 0, 0
+            
+    def build_speed_table(self):
+        """Evaluate the decision tree once for each of the 64 environment flag combinations"""
+        table = []
+        for key in range(64):
+            table.append(self.decide_maneuver(self.environment_flags(key)))
+        return tuple(table)
+        
+    def rescale_speed_table(self):
+        """Apply the current base speed to the decision table's speed ratios"""
+        base_speed = self.max_speed * self.speed_multiplier
+        self._scaled_table = tuple(
+            (base_speed * left_ratio, base_speed * right_ratio, action_id, turns, wall_contacts)
+            for left_ratio, right_ratio, action_id, turns, wall_contacts in self._speed_table)
+        
+    def _tick(self, step_count):
+        """One control tick: read sensors, pick speeds, drive motors and track the path"""
+        # Read sensors and store their moving averages in the shared buffer:
+        # swap the oldest ring entry for the new reading in the running sum
+        readings = self._readings
+        ring = self._sensor_ring
+        ring_sum = self._ring_sum
+        scale = FILTER_SCALE
+        base = self._ring_idx * 8
+        for i, get_value in enumerate(self._sensor_getvals):
+            value = get_value()
+            ring_sum[i] += value - ring[base + i]
+            ring[base + i] = value
+            readings[i] = ring_sum[i] * scale
+        self._ring_idx = (self._ring_idx + 1) & (FILTER_WINDOW - 1)
             
-        return left_speed, right_speed, action
+        # Environment analysis: strongest reading on each side against both thresholds
+        close_threshold, medium_threshold = self._thresholds
+        front = max(readings[7], readings[0])
+        left = max(readings[5], readings[6])
+        right = max(readings[1], readings[2])
+        key = ((front > close_threshold) << 5 | (front > medium_threshold) << 4
+               | (left > close_threshold) << 3 | (left > medium_threshold) << 2
+               | (right > close_threshold) << 1 | (right > medium_threshold))
+        
+        # Optimal speeds from the pre-scaled decision table
+        left_speed, right_speed, action_id, turns, wall_contacts = self._scaled_table[key]
+        self.current_action = action_id
+        self.turns_made += turns
+        if wall_contacts and not self._prev_left_close:
+            self.wall_contacts += wall_contacts
+        self._prev_left_close = bool(wall_contacts)
+        
+        # Set motor speeds
+        self._set_left(left_speed)
+        self._set_right(right_speed)
         
-    def update_position_tracking(self, left_speed, right_speed):
-        """Track robot's approximate position and path"""
-        # Simple odometry (approximate)
-        avg_speed = (abs(left_speed) + abs(right_speed)) / 2
-        self.path_length += avg_speed * (self.timestep / 1000.0) * 0.1  # Rough conversion
+        # Simple odometry (approximate), folded into path_length when recording;
+        # the increment is only recomputed when a wheel speed changed
+        if left_speed != self._last_left or right_speed != self._last_right:
+            self._last_left = left_speed
+            self._last_right = right_speed
+            self._last_increment = (abs(left_speed) + abs(right_speed)) * self._odometry_scale
+        self._pending_dist += self._last_increment
         
         # Store position data every few steps
-        if len(self.position_history) == 0 or len(self.position_history) % 10 == 0:
-            self.position_history.append({
-                'time': time.time() - self.start_time,
-                'path_length': self.path_length,
-                'turns': self.turns_made,
-                'wall_contacts': self.wall_contacts
-            })
+        if step_count % 10 == 0 or not self._hist_time:
+            self.record_position_sample()
             
+    def _prime_filter(self):
+        """Fill the filter window with the current readings, so the average starts at them"""
+        ring = self._sensor_ring
+        for i, get_value in enumerate(self._sensor_getvals):
+            value = get_value()
+            ring[i::8] = [value] * FILTER_WINDOW
+            self._ring_sum[i] = value * FILTER_WINDOW
+            
+    def record_position_sample(self):
+        """Append the current metrics to the position history"""
+        self.flush_path_length()
+        self._hist_time.append(time.monotonic() - self.start_time)
+        self._hist_path.append(self.path_length)
+        self._hist_turns.append(self.turns_made)
+        self._hist_walls.append(self.wall_contacts)
+        
+    def flush_path_length(self):
+        """Add the distance accumulated since the last history sample to path_length"""
+        self.path_length += self._pending_dist
+        self._pending_dist = 0.0
+        
+    @property
+    def position_history(self):
+        """Recorded samples as (time, path_length, turns, wall_contacts) tuples"""
+        return list(zip(self._hist_time, self._hist_path, self._hist_turns, self._hist_walls))
+        
     def adaptive_speed_adjustment(self, step_count):
-        """Dynamically adjust speed based on performance"""
+        """Dynamically adjust speed based on performance (called every ADAPTIVE_INTERVAL steps)"""
+        old_multiplier = self.speed_multiplier
         if step_count > 500:
             # Increase speed after robot has learned the environment
-            self.speed_multiplier = min(1.2, self.speed_multiplier + 0.001)
+            self.speed_multiplier = min(1.2, self.speed_multiplier + 0.001 * ADAPTIVE_INTERVAL)
         elif self.wall_contacts > 10:
             # Reduce speed if too many wall contacts
-            self.speed_multiplier = max(0.7, self.speed_multiplier - 0.01)
+            self.speed_multiplier = max(0.7, self.speed_multiplier - 0.01 * ADAPTIVE_INTERVAL)
+            
+        # Rescale the decision table only when the multiplier actually moved
+        if self.speed_multiplier != old_multiplier:
+            self.rescale_speed_table()
             
     def print_performance_stats(self, step_count):
         """Print detailed performance statistics"""
-        elapsed_time = time.time() - self.start_time
+        self.flush_path_length()
+        elapsed_time = time.monotonic() - self.start_time
+        action = ACTION_NAMES[self.current_action] if self.current_action is not None else "None"
         
-        print(f"\n╔═══ Performance Statistics (Step {step_count}) ═══╗")
-        print(f"║ Elapsed Time: {elapsed_time:.2f}s")
-        print(f"║ Path Length: {self.path_length:.2f} units")
-        print(f"║ Turns Made: {self.turns_made}")
-        print(f"║ Wall Contacts: {self.wall_contacts}")
-        print(f"║ Speed Multiplier: {self.speed_multiplier:.2f}")
-        print(f"║ Avg Speed: {self.path_length/elapsed_time:.2f} units/s")
-        print(f"╚═══════════════════════════════════════════════════╝")
+        # Build the whole block first, then issue a single write
+        sys.stdout.write(
+            f"\n╔═══ Performance Statistics (Step {step_count}) ═══╗\n"
+            f"║ Elapsed Time: {elapsed_time:.2f}s\n"
+            f"║ Current Action: {action}\n"
+            f"║ Path Length: {self.path_length:.2f} units\n"
+            f"║ Turns Made: {self.turns_made}\n"
+            f"║ Wall Contacts: {self.wall_contacts}\n"
+            f"║ Speed Multiplier: {self.speed_multiplier:.2f}\n"
+            f"║ Avg Speed: {self.path_length/elapsed_time:.2f} units/s\n"
+            f"╚═══════════════════════════════════════════════════╝\n")
         
     def export_performance_data(self):
         """Export performance data for analysis"""
         filename = f"maze_performance_{int(time.time())}.txt"
+        self.flush_path_length()
         
         try:
             with open(filename, 'w') as f:
@@ -165,9 +265,9 @@ class OptimizedMazeSolver:
                 
                 f.write("Time Series Data:\n")
                 f.write("Time(s)\tPath Length\tTurns\tWall Contacts\n")
-                for data in self.position_history:
-                    f.write(f"{data['time']:.2f}\t{data['path_length']:.2f}\t"
-                           f"{data['turns']}\t{data['wall_contacts']}\n")
+                # Format all rows first, then hand them to the file in one write
+                f.write("".join(f"{t:.2f}\t{path:.2f}\t{turns}\t{walls}\n"
+                                for t, path, turns, walls in self.position_history))
                            
             print(f"Performance data exported to {filename}")
         except Exception as e:
@@ -178,33 +278,39 @@ class OptimizedMazeSolver:
         print("Starting Optimized Maze Solver...")
         print("Features: Performance tracking, adaptive speed, path recording")
         
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         step_count = 0
         
+        # Per-step calls and the adaptive interval mask
+        step = self.robot.step
+        timestep = self.timestep
+        tick = self._tick
+        adaptive_speed_adjustment = self.adaptive_speed_adjustment
+        adaptive_mask = ADAPTIVE_INTERVAL - 1
+        
         try:
-            while self.robot.step(self.timestep) != -1:
-                step_count += 1
-                
-                # Analyze environment
-                environment = self.analyze_maze_environment()
+            # Sensors report from the first step on: seed the filter with that
+            # reading, then tick on the same step
+            running = step(timestep) != -1
+            if running:
+                self._prime_filter()
                 
-                # Calculate optimal speeds
-                left_speed, right_speed, action = self.calculate_optimal_speeds(environment)
-                
-                # Apply adaptive speed adjustment
-                self.adaptive_speed_adjustment(step_count)
+            while running:
+                step_count += 1
                 
-                # Set motor speeds
-                self.left_motor.setVelocity(left_speed)
-                self.right_motor.setVelocity(right_speed)
+                # Sense, decide, drive and track in a single call
+                tick(step_count)
                 
-                # Update tracking
-                self.update_position_tracking(left_speed, right_speed)
+                # Apply adaptive speed adjustment periodically (takes effect from the next tick)
+                if step_count & adaptive_mask == 0:
+                    adaptive_speed_adjustment(step_count)
                 
                 # Print statistics periodically
                 if step_count % 200 == 0:
                     self.print_performance_stats(step_count)
                     
+                running = step(timestep) != -1
+                
         except KeyboardInterrupt:
             print("\nMaze solver stopped by user.")
             self.export_performance_data()